@@ -1,7 +1,13 @@
 # async_runner.py
 import asyncio
 import threading
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+try:
+    # ~2x asyncio throughput on HTTP-heavy workloads; purely optional.
+    import uvloop
+except ImportError:
+    uvloop = None
 
 _loop: Optional[asyncio.AbstractEventLoop] = None
 _loop_thread: Optional[threading.Thread] = None
@@ -17,7 +23,7 @@ def start_background_loop() -> asyncio.AbstractEventLoop:
         asyncio.set_event_loop(loop)
         loop.run_forever()
 
-    _loop = asyncio.new_event_loop()
+    _loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
     _loop_thread = threading.Thread(target=_run, args=(_loop,), daemon=True)
     _loop_thread.start()
     return _loop
@@ -32,11 +38,57 @@ def stop_background_loop() -> None:
     _loop_thread = None
 
 
-def run_coro_threadsafe(coro, timeout: Optional[float] = None) -> Any:
+def run_coro_threadsafe(
+    coro,
+    timeout: Optional[float] = None,
+    on_done: Optional[Callable[["asyncio.Task"], None]] = None,
+) -> Any:
     """
     Schedule a coroutine on the background loop and wait for the result.
     Raises exceptions coming from the coroutine.
+
+    The loop is persistent (one daemon thread for the process lifetime), so
+    callers batching independent work should submit a single gather coroutine
+    rather than several calls — each call pays one thread handoff. The wakeup
+    goes through a bare `call_soon_threadsafe` + `threading.Event` rather than
+    `run_coroutine_threadsafe`, skipping the concurrent.futures
+    Future/condition-variable layers on every call. If `on_done` is given the
+    call does not block at all: the callback receives the finished Task on the
+    loop thread and the function returns None immediately.
     """
-    loop = start_background_loop()
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
-    return future.result(timeout)
+    # Fast path: the loop is almost always already up; skip the builder call.
+    loop = (
+        _loop if (_loop is not None and _loop.is_running()) else start_background_loop()
+    )
+    if threading.current_thread() is _loop_thread:
+        # Waiting here would deadlock the loop on itself.
+        raise RuntimeError("run_coro_threadsafe called from the background loop thread")
+
+    if on_done is not None:
+        loop.call_soon_threadsafe(
+            lambda: loop.create_task(coro).add_done_callback(on_done)
+        )
+        return None
+
+    done = threading.Event()
+    outcome: list = []
+
+    def _schedule() -> None:
+        task = loop.create_task(coro)
+
+        def _finish(t: "asyncio.Task") -> None:
+            try:
+                outcome.append((t.result(), None))
+            except BaseException as exc:  # propagate to the waiting thread
+                outcome.append((None, exc))
+            done.set()
+
+        task.add_done_callback(_finish)
+
+    loop.call_soon_threadsafe(_schedule)
+    if not done.wait(timeout):
+        raise TimeoutError("coroutine did not finish within timeout")
+    result, exc = outcome[0]
+    if exc is not None:
+        raise exc
+    return result
@@ -1,14 +1,40 @@
 # ingestion.py
+import io
 import os
 import re
+import asyncio
+import hashlib
+import logging
 import pathlib
-from typing import List
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
+
 load_dotenv()
+
+# Thread budgets must land before docling/torch/onnxruntime are first imported,
+# otherwise their pools are already sized (sometimes to 1, sometimes to way too
+# many) by the time we could configure them.
+os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 1))
+os.environ.setdefault("MKL_NUM_THREADS", os.environ["OMP_NUM_THREADS"])
+os.environ.setdefault("OPENBLAS_NUM_THREADS", os.environ["OMP_NUM_THREADS"])
+# HuggingFace tokenizers fork their own thread pool and warn on every
+# chunking pass otherwise; chunking parallelism comes from asyncio here.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
 import uuid
 from docling.document_converter import DocumentConverter
 
+try:
+    import torch
+
+    torch.set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+except ImportError:
+    torch = None
+
 # LightRAG imports
 from lightrag import LightRAG
 from lightrag.llm.openai import gpt_4o_mini_complete, openai_embed
@@ -17,6 +43,8 @@ from lightrag.kg.shared_storage import initialize_pipeline_status
 # Import the background runner
 from async_runner import run_coro_threadsafe, start_background_loop
 
+logger = logging.getLogger(__name__)
+
 # Files LightRAG writes; useful when resetting a workdir
 _LR_FILES: List[str] = [
     "graph_chunk_entity_relation.graphml",
@@ -27,31 +55,232 @@ _LR_FILES: List[str] = [
     "vdb_entities.json",
     "vdb_relationships.json",
 ]
+_LR_FILE_SET = frozenset(_LR_FILES)
+
+# Public alias — single source of truth for the storage file names the app
+# checks for (lightrag_app.py used to keep its own copy of this list).
+STORAGE_FILES = tuple(_LR_FILES)
 
 # Expose the supported modes in one place
 QUERY_MODES = ["naive", "local", "global", "hybrid", "mix"]
+
+# Whitespace normalization patterns, compiled once — these run over the full
+# extracted text of every document.
+_WS_RUNS = re.compile(r"[ \t]+")
+_BLANK_RUNS = re.compile(r"\n{3,}")
 # QUERY_MODES = ["naive", "local", "hybrid"]
 
+# Docling converters are expensive to build (they load layout/table models), so
+# keep one per profile per process and reuse them across conversions:
+#   "fast" — no OCR, no table structure; handles text-native PDFs in seconds.
+#   "full" — OCR + table structure; the fallback for scanned documents.
+_CONVERTERS: dict = {}
+_CONVERTER_LOCK = threading.Lock()
+
+
+def _build_converter(profile: str) -> DocumentConverter:
+    """Build a DocumentConverter for the given profile, honoring Docling env vars.
+
+    DOCLING_BACKEND=pypdfium swaps in the lighter pypdfium backend (~2x faster,
+    far lower peak memory than the default parser); leave it unset for the
+    default backend when OCR/table fidelity matters more than throughput.
+    The accelerator device is auto-detected so CUDA/MPS are used when present.
+    """
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import (
+        AcceleratorDevice,
+        AcceleratorOptions,
+        PdfPipelineOptions,
+    )
+    from docling.document_converter import PdfFormatOption
+
+    full = profile == "full"
+    pipeline_options = PdfPipelineOptions(
+        do_ocr=full,
+        do_table_structure=full,
+        accelerator_options=AcceleratorOptions(
+            device=AcceleratorDevice.AUTO,
+            num_threads=os.cpu_count() or 1,
+        ),
+    )
+    pdf_format_option = PdfFormatOption(pipeline_options=pipeline_options)
+
+    if os.getenv("DOCLING_BACKEND", "").lower() == "pypdfium":
+        from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+
+        pdf_format_option = PdfFormatOption(
+            pipeline_options=pipeline_options, backend=PyPdfiumDocumentBackend
+        )
+    return DocumentConverter(format_options={InputFormat.PDF: pdf_format_option})
+
+
+def get_converter(profile: str = "fast") -> DocumentConverter:
+    """Return the shared DocumentConverter for a profile, creating it on first use."""
+    converter = _CONVERTERS.get(profile)
+    if converter is None:
+        with _CONVERTER_LOCK:
+            converter = _CONVERTERS.get(profile)
+            if converter is None:
+                converter = _CONVERTERS[profile] = _build_converter(profile)
+    return converter
+
+
+# Pool of worker processes for Docling conversion. Conversion is CPU-bound and
+# the models are large, so separate processes let multiple PDFs convert in
+# parallel without fighting over the GIL and keep model RSS out of the
+# Streamlit process; each worker warms its own converter at startup.
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _preload_docling() -> None:
+    """Worker initializer: pin BLAS/OMP threads and warm the Docling models."""
+    # One OMP thread per worker — the pool itself provides the parallelism.
+    os.environ["OMP_NUM_THREADS"] = "1"
+    if torch is not None:
+        torch.set_num_threads(1)
+    get_converter()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        with _PDF_POOL_LOCK:
+            if _PDF_POOL is None:
+                # Conversion scales near-linearly with cores (workers pin OMP to
+                # 1 thread each, so there's no oversubscription to fear).
+                workers = int(os.getenv("PDF_POOL_WORKERS", os.cpu_count() or 1))
+                _PDF_POOL = ProcessPoolExecutor(
+                    max_workers=max(1, workers),
+                    initializer=_preload_docling,
+                )
+    return _PDF_POOL
+
+
+def warm_converters() -> None:
+    """Spawn the conversion workers (and their Docling model loads) eagerly.
+
+    Worker startup runs ``_preload_docling``, which is where the multi-second
+    model initialization lives; submitting one no-op per worker forces every
+    process into existence before the user's first ingest click. A no-op when
+    a docling-serve instance is configured — the models live over there.
+    """
+    if _docling_serve_url() is not None:
+        return
+    pool = _get_pdf_pool()
+    for fut in [pool.submit(os.getpid) for _ in range(pool._max_workers)]:
+        fut.result()
+
+
+def _fast_rmtree(path: str) -> None:
+    """Remove a directory tree without shutil.rmtree's per-entry path re-resolution.
+
+    Files are unlinked relative to the already-open directory fd (unlinkat under
+    the hood) and sibling subtrees are deleted in parallel — workdirs full of
+    uploaded PDFs plus LightRAG KV/vector JSONs are exactly the shallow,
+    many-entry shape where the serial walk hurts.
+    """
+    try:
+        dfd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        return
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    try:
+                        os.unlink(entry.name, dir_fd=dfd)
+                    except FileNotFoundError:
+                        pass
+    finally:
+        os.close(dfd)
+
+    if len(subdirs) == 1:
+        _fast_rmtree(subdirs[0])
+    elif subdirs:
+        with ThreadPoolExecutor(max_workers=min(16, len(subdirs))) as pool:
+            list(pool.map(_fast_rmtree, subdirs))
+
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+# Deletions happen off the caller's thread; the caller only pays for a rename.
+_RMTREE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rmtree")
+
+
+def remove_and_recreate_dirs(*dirs: str) -> None:
+    """Wipe and recreate the given directories (workdir reset).
+
+    Each directory is atomically renamed aside and recreated empty, so the
+    caller can start writing immediately; the actual tree removal runs on a
+    background thread, overlapped with whatever work follows the reset.
+    """
+    for d in dirs:
+        trash = f"{d}.trash-{uuid.uuid4().hex}"
+        try:
+            os.rename(d, trash)
+        except FileNotFoundError:
+            pass
+        else:
+            _RMTREE_POOL.submit(_fast_rmtree, trash)
+        os.makedirs(d, exist_ok=True)
+
+
 def clear_workdir_files(working_dir: str):
-    """Delete LightRAG output files so a fresh ingest can occur."""
+    """Delete LightRAG output files so a fresh ingest can occur.
+
+    One directory scan plus dir_fd-relative unlinks instead of a per-file
+    exists+remove pair, so each victim costs a single syscall with no path
+    re-resolution.
+    """
     os.makedirs(working_dir, exist_ok=True)
-    for fname in _LR_FILES:
-        fpath = os.path.join(working_dir, fname)
-        if os.path.exists(fpath):
-            try:
-                os.remove(fpath)
-            except Exception:
-                pass
+    dfd = os.open(working_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        with os.scandir(working_dir) as entries:
+            for entry in entries:
+                if entry.name in _LR_FILE_SET:
+                    try:
+                        os.unlink(entry.name, dir_fd=dfd)
+                    except FileNotFoundError:
+                        pass
+    finally:
+        os.close(dfd)
+
 
+# Chunks sent per embedding HTTP request. LightRAG batches internally; the
+# default (10) leaves a lot of round-trips on the table for multi-PDF ingests.
+_EMBED_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_NUM", "32"))
 
-async def _abuild_rag(working_dir: str, chunk_token_size: int, chunk_overlap_token_size: int) -> LightRAG:
+
+async def _abuild_rag(
+    working_dir: str,
+    chunk_token_size: int,
+    chunk_overlap_token_size: int,
+    embedding_batch_num: int = _EMBED_BATCH_SIZE,
+) -> LightRAG:
+    # Storage backends follow the API server's env knobs; the default JSON KV
+    # store re-reads files per query, so e.g. LIGHTRAG_KV_STORAGE=RedisKVStorage
+    # (with REDIS_URI set) turns those into O(1) keyed reads on large KBs.
     rag = LightRAG(
         working_dir=working_dir,
         embedding_func=openai_embed,
         llm_model_func=gpt_4o_mini_complete,
         chunk_token_size=chunk_token_size,
         chunk_overlap_token_size=chunk_overlap_token_size,
-        enable_llm_cache=False
+        embedding_batch_num=embedding_batch_num,
+        enable_llm_cache=False,
+        kv_storage=os.getenv("LIGHTRAG_KV_STORAGE", "JsonKVStorage"),
+        vector_storage=os.getenv("LIGHTRAG_VECTOR_STORAGE", "NanoVectorDBStorage"),
+        graph_storage=os.getenv("LIGHTRAG_GRAPH_STORAGE", "NetworkXStorage"),
+        doc_status_storage=os.getenv(
+            "LIGHTRAG_DOC_STATUS_STORAGE", "JsonDocStatusStorage"
+        ),
     )
     await rag.initialize_storages()
     await initialize_pipeline_status()
@@ -62,13 +291,68 @@ async def _ainsert_text(rag: LightRAG, text: str):
     await rag.ainsert(text)
 
 
-def build_rag(working_dir: str, chunk_token_size: int = 200, chunk_overlap_token_size: int = 40) -> LightRAG:
+# How many documents to insert concurrently; enough to keep the OpenAI
+# round-trips overlapped without flooding the pipeline.
+_INSERT_CONCURRENCY = 4
+
+
+async def _ainsert_many(rag: LightRAG, texts: Sequence[str]):
+    sem = asyncio.Semaphore(_INSERT_CONCURRENCY)
+
+    async def _one(text: str):
+        async with sem:
+            await rag.ainsert(text)
+
+    await asyncio.gather(*(_one(text) for text in texts))
+
+
+async def _aingest_many(rag: LightRAG, items: Sequence[Tuple[str, str]]) -> List[str]:
+    """Convert several spooled PDFs concurrently and insert the extracted texts.
+
+    ``items`` are (spool_path, filename) pairs from spool_to_tmp — only paths
+    cross thread/process boundaries, never whole documents. Conversions run in
+    the process pool (CPU-bound), insertions overlap on the event loop
+    (I/O-bound), so N documents cost roughly max() instead of sum(). Returns
+    the names of the documents that were ingested.
+    """
+    serve_url = _docling_serve_url()
+    if serve_url:
+        # docling-serve conversions are plain HTTP and parallelize on the loop itself.
+        texts = await asyncio.gather(
+            *(
+                _apdf_path_to_text(spool_path, name, serve_url)
+                for spool_path, name in items
+            )
+        )
+    else:
+        loop = asyncio.get_running_loop()
+        pool = _get_pdf_pool()
+        texts = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _convert_spool_in_worker, spool_path, name)
+                for spool_path, name in items
+            )
+        )
+    await _ainsert_many(rag, texts)
+    return [name for _, name in items]
+
+
+def build_rag(
+    working_dir: str,
+    chunk_token_size: int = 200,
+    chunk_overlap_token_size: int = 40,
+    embedding_batch_num: int = _EMBED_BATCH_SIZE,
+) -> LightRAG:
     """
     Synchronously build a LightRAG instance — but schedule the build on the shared background loop
     so that all asyncio primitives inside LightRAG are bound to the same event loop used later for queries.
     """
     start_background_loop()  # ensure loop is running
-    return run_coro_threadsafe(_abuild_rag(working_dir, chunk_token_size, chunk_overlap_token_size))
+    return run_coro_threadsafe(
+        _abuild_rag(
+            working_dir, chunk_token_size, chunk_overlap_token_size, embedding_batch_num
+        )
+    )
 
 
 def insert_text_into_rag(rag: LightRAG, text: str):
@@ -76,13 +360,18 @@ def insert_text_into_rag(rag: LightRAG, text: str):
     return run_coro_threadsafe(_ainsert_text(rag, text))
 
 
-def pdf_bytes_to_text(pdf_bytes: bytes, filename: str | None = None) -> str:
-    """
-    Convert PDF bytes to plain text using Docling and save the original PDF and the extracted text
-    into .tmp_docling. If filename is provided, use that filename (preserving original name).
-    This avoids writing a fixed upload.pdf/upload.txt pair.
-    Returns the extracted text.
-    """
+def insert_texts_into_rag(rag: LightRAG, texts: Sequence[str]):
+    """Sync wrapper: insert several already-converted texts concurrently (bounded)."""
+    return run_coro_threadsafe(_ainsert_many(rag, texts))
+
+
+def insert_many_into_rag(rag: LightRAG, items: Sequence[Tuple[str, str]]) -> List[str]:
+    """Sync wrapper: convert + ingest a batch of (spool_path, filename) pairs concurrently."""
+    return run_coro_threadsafe(_aingest_many(rag, items))
+
+
+def _target_pdf_path(filename: str | None) -> pathlib.Path:
+    """Resolve the per-file path under .tmp_docling for an uploaded PDF."""
     tmp_dir = working_dir_for_tmp()
 
     # Use provided filename if present; otherwise generate a unique name.
@@ -98,30 +387,322 @@ def pdf_bytes_to_text(pdf_bytes: bytes, filename: str | None = None) -> str:
 
     pdf_path = pathlib.Path(tmp_dir) / base_name
     pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    return pdf_path
 
-    # Write the PDF bytes directly to the per-file path
-    pdf_path.write_bytes(pdf_bytes)
-
-    # Convert with Docling using the real file path (Docling expects a path)
-    converter = DocumentConverter()
-    result = converter.convert(str(pdf_path))
 
-    text = result.document.export_to_text()
+def _finish_extraction(pdf_path: pathlib.Path, text: str) -> str:
+    """Normalize whitespace and save the extracted text next to the PDF."""
+    text = _WS_RUNS.sub(" ", text)
+    text = _BLANK_RUNS.sub("\n\n", text)
 
-    # Normalize whitespace a bit
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-
-    # Save the extracted text next to the PDF with the same basename
     out_txt = pdf_path.with_suffix(".txt")
     out_txt.write_text(text, encoding="utf-8")
+    return text
 
+
+def _cache_path_for_digest(digest: str) -> pathlib.Path:
+    return pathlib.Path(working_dir_for_tmp()) / f"{digest}.txt"
+
+
+def _text_cache_path(pdf_bytes: bytes) -> pathlib.Path:
+    """Content-addressed path for the extracted text of these PDF bytes."""
+    return _cache_path_for_digest(
+        hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+    )
+
+
+def _load_cached_text(cache_path: pathlib.Path) -> str | None:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def _store_cached_text(cache_path: pathlib.Path, text: str) -> None:
+    # Write-then-rename so concurrent conversions never observe a torn file.
+    tmp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+# Buffer size for streaming uploads to disk — large PDFs never need to be
+# materialized as one Python bytes object in this process.
+_SPOOL_CHUNK = 1 << 20
+
+
+def spool_to_tmp(fileobj, filename: str | None = None) -> str:
+    """Stream an uploaded file-like object into .tmp_docling in 1 MiB chunks.
+
+    Returns the spool file path; ingestion consumes (and removes) it.
+    """
+    import shutil
+    import tempfile
+
+    fd, spool_path = tempfile.mkstemp(
+        suffix=".pdf", prefix="spool_", dir=working_dir_for_tmp()
+    )
+    with os.fdopen(fd, "wb") as out:
+        fileobj.seek(0)
+        shutil.copyfileobj(fileobj, out, length=_SPOOL_CHUNK)
+    return spool_path
+
+
+def _hash_file(path: str) -> str:
+    # blake2b is the fastest digest in hashlib for bulk data; 16 bytes is
+    # plenty for content addressing and keeps the cache filenames short.
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_SPOOL_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _discard_spool(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _docling_serve_url() -> str | None:
+    """URL of a docling-serve instance, or None to convert in-process."""
+    url = os.getenv("DOCLING_SERVE_URL", "").strip()
+    return url.rstrip("/") or None
+
+
+def _parse_serve_response(payload: dict) -> str:
+    document = payload.get("document") or {}
+    text = document.get("md_content") or document.get("text_content")
+    if text is None:
+        raise RuntimeError("docling-serve response contained no document content")
+    return text
+
+
+async def _aconvert_via_serve(content, base_name: str, serve_url: str) -> str:
+    """Convert a PDF (bytes or open file handle) through docling-serve.
+
+    One AsyncClient is shared per loop so concurrent conversions reuse
+    connections.
+    """
+    global _SERVE_CLIENT
+    import httpx
+
+    if _SERVE_CLIENT is None:
+        _SERVE_CLIENT = httpx.AsyncClient(timeout=httpx.Timeout(300.0))
+    resp = await _SERVE_CLIENT.post(
+        f"{serve_url}/v1/convert/file",
+        files={"files": (base_name, content, "application/pdf")},
+    )
+    resp.raise_for_status()
+    return _parse_serve_response(resp.json())
+
+
+_SERVE_CLIENT = None
+
+
+def _persist_pdf_async(pdf_path: pathlib.Path, pdf_bytes: bytes) -> None:
+    """Write the uploaded PDF to .tmp_docling off the conversion critical path."""
+    threading.Thread(
+        target=pdf_path.write_bytes, args=(pdf_bytes,), daemon=True
+    ).start()
+
+
+async def _apdf_bytes_to_text(
+    pdf_bytes: bytes, filename: str | None, serve_url: str, persist_pdf: bool = False
+) -> str:
+    """Async variant of pdf_bytes_to_text that converts through docling-serve."""
+    cache_path = _text_cache_path(pdf_bytes)
+    cached = _load_cached_text(cache_path)
+    if cached is not None:
+        return cached
+
+    pdf_path = _target_pdf_path(filename)
+    if persist_pdf:
+        _persist_pdf_async(pdf_path, pdf_bytes)
+    text = await _aconvert_via_serve(pdf_bytes, pdf_path.name, serve_url)
+    text = _finish_extraction(pdf_path, text)
+    _store_cached_text(cache_path, text)
+    return text
+
+
+async def _apdf_path_to_text(
+    spool_path: str, filename: str | None, serve_url: str
+) -> str:
+    """Convert a spooled upload through docling-serve; consumes the spool file."""
+    cache_path = _cache_path_for_digest(_hash_file(spool_path))
+    cached = _load_cached_text(cache_path)
+    if cached is not None:
+        _discard_spool(spool_path)
+        return cached
+
+    pdf_path = _target_pdf_path(filename)
+    try:
+        with open(spool_path, "rb") as fh:
+            text = await _aconvert_via_serve(fh, pdf_path.name, serve_url)
+        text = _finish_extraction(pdf_path, text)
+        _store_cached_text(cache_path, text)
+        return text
+    finally:
+        _discard_spool(spool_path)
+
+
+def _convert_in_worker(
+    pdf_bytes: bytes, filename: str | None = None, persist_pdf: bool = False
+) -> str:
+    """Full in-process conversion pipeline; runs inside a pool worker."""
+    cache_path = _text_cache_path(pdf_bytes)
+    cached = _load_cached_text(cache_path)
+    if cached is not None:
+        return cached
+
+    pdf_path = _target_pdf_path(filename)
+
+    # Only keep an on-disk PDF copy when asked; conversion reads straight from
+    # memory either way, and the write happens off the critical path.
+    if persist_pdf:
+        _persist_pdf_async(pdf_path, pdf_bytes)
+
+    text = _finish_extraction(pdf_path, _convert_local(pdf_bytes, pdf_path.name))
+    _store_cached_text(cache_path, text)
+    return text
+
+
+def _convert_spool_in_worker(
+    spool_path: str, filename: str | None = None, persist_pdf: bool = False
+) -> str:
+    """Like _convert_in_worker, but for a spooled upload already on disk.
+
+    The document is hashed incrementally and converted straight from the file,
+    so it is never materialized as one bytes object. The spool file is
+    consumed: renamed into place when persist_pdf, removed otherwise.
+    """
+    cache_path = _cache_path_for_digest(_hash_file(spool_path))
+    cached = _load_cached_text(cache_path)
+    if cached is not None:
+        _discard_spool(spool_path)
+        return cached
+
+    pdf_path = _target_pdf_path(filename)
+    source: object = spool_path
+    if persist_pdf:
+        os.replace(spool_path, pdf_path)
+        source = str(pdf_path)
+    try:
+        text = _finish_extraction(pdf_path, _convert_local(source, pdf_path.name))
+        _store_cached_text(cache_path, text)
+        return text
+    finally:
+        if not persist_pdf:
+            _discard_spool(spool_path)
+
+
+# Below this many characters per page the PDF is likely scanned and needs OCR.
+_MIN_CHARS_PER_PAGE = 20
+
+
+def _convert_local(source, name: str) -> str:
+    """Two-tier in-process conversion: text-layer fast path, OCR fallback.
+
+    ``source`` is either PDF bytes (converted from an in-memory stream, so
+    Docling doesn't re-read data we already hold) or a path on disk (which the
+    backend memory-maps — no full copy in this process at all).
+
+    The fast profile (no OCR, no table structure) handles text-native PDFs —
+    the common case — in seconds. Only when it comes back with a suspiciously
+    sparse text layer do we pay for the full OCR pipeline. DOCLING_DO_OCR=true
+    skips the fast tier entirely.
+    """
+    from docling.datamodel.base_models import DocumentStream
+
+    def _conv_source():
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return DocumentStream(name=name, stream=io.BytesIO(source))
+        return str(source)
+
+    force_full = os.getenv("DOCLING_DO_OCR", "false").lower() == "true"
+    profile = "full" if force_full else "fast"
+    result = get_converter(profile).convert(_conv_source())
+    text = result.document.export_to_text()
+
+    if profile == "fast":
+        num_pages = len(getattr(result.document, "pages", {})) or 1
+        if len(text.strip()) < _MIN_CHARS_PER_PAGE * num_pages:
+            logger.info(
+                "Sparse text layer in %s (%d chars over %d pages); retrying with OCR pipeline",
+                name,
+                len(text.strip()),
+                num_pages,
+            )
+            result = get_converter("full").convert(_conv_source())
+            text = result.document.export_to_text()
+        else:
+            logger.info("Converted %s via text-layer fast path", name)
     return text
 
 
+def pdf_bytes_to_text(
+    pdf_bytes, filename: str | None = None, persist_pdf: bool = False
+) -> str:
+    """
+    Convert a PDF (bytes or a binary file-like object, e.g. a Streamlit
+    UploadedFile) to plain text and save the extracted text into .tmp_docling;
+    pass persist_pdf=True to also keep the original PDF there. If filename is
+    provided, use that filename (preserving original name). This avoids
+    writing a fixed upload.pdf/upload.txt pair.
+
+    File-like sources are spooled to disk in 1 MiB chunks and converted from
+    the path, so the document is never materialized as one bytes object in
+    this process. When DOCLING_SERVE_URL is set, conversion is delegated to a
+    docling-serve instance; otherwise Docling runs in a warmed worker process
+    from the pool, keeping model memory and GIL contention out of the calling
+    process. Returns the extracted text.
+
+    Extraction results are cached on disk keyed by content hash, so
+    re-uploading the same document is a file read instead of a re-conversion.
+    """
+    if not isinstance(pdf_bytes, (bytes, bytearray, memoryview)):
+        spool_path = spool_to_tmp(pdf_bytes, filename)
+        serve_url = _docling_serve_url()
+        if serve_url:
+            if persist_pdf:
+                import shutil
+
+                shutil.copyfile(spool_path, _target_pdf_path(filename))
+            return run_coro_threadsafe(
+                _apdf_path_to_text(spool_path, filename, serve_url)
+            )
+        return (
+            _get_pdf_pool()
+            .submit(_convert_spool_in_worker, spool_path, filename, persist_pdf)
+            .result()
+        )
+
+    cached = _load_cached_text(_text_cache_path(pdf_bytes))
+    if cached is not None:
+        return cached
+
+    serve_url = _docling_serve_url()
+    if serve_url:
+        # Run the async serve pipeline on the background loop so conversions
+        # share _SERVE_CLIENT's connection pool instead of a one-shot post.
+        return run_coro_threadsafe(
+            _apdf_bytes_to_text(pdf_bytes, filename, serve_url, persist_pdf)
+        )
+
+    return (
+        _get_pdf_pool()
+        .submit(_convert_in_worker, pdf_bytes, filename, persist_pdf)
+        .result()
+    )
+
+
+@functools.lru_cache(maxsize=1)
 def working_dir_for_tmp() -> str:
     """
     Ensures a place exists to write conversion temp files (.tmp_docling under project root).
+
+    Cached so the getcwd/join/makedirs (the last one a stat even with
+    exist_ok) run once per process instead of once per conversion.
     """
     d = os.path.join(os.getcwd(), ".tmp_docling")
     os.makedirs(d, exist_ok=True)
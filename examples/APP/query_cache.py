@@ -0,0 +1,140 @@
+# query_cache.py
+"""Two-tier cache for RAG query answers.
+
+Tier 1 (exact): LRU + TTL keyed on (mode, normalized query text) — repeat
+queries during iterative UI use come back in microseconds instead of seconds
+of LLM + vector search.
+
+Tier 2 (semantic): cosine similarity over the embeddings of previously
+answered queries; a near-duplicate phrasing (similarity >= threshold) reuses
+the cached answer. The table is bounded by the same maxsize, so a plain
+matrix-vector product is all the "index" we need.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from cache_utils import cosine_scores
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 300.0
+DEFAULT_SEMANTIC_THRESHOLD = 0.95
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.strip().lower().split())
+
+
+class QueryCache:
+    """Thread-safe exact + semantic cache of (mode, query) -> answer."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        semantic_threshold: float = DEFAULT_SEMANTIC_THRESHOLD,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self._lock = threading.Lock()
+        # (mode, normalized query) -> (expires_at, answer)
+        self._exact: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        # Parallel structures for the semantic tier; embeddings are L2-normalized.
+        self._embeddings: Optional[np.ndarray] = None
+        self._entries: List[Tuple[float, str, Any]] = []  # (expires_at, mode, answer)
+
+    def get_exact(self, mode: str, query: str) -> Optional[Any]:
+        key = (mode, _normalize_query(query))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._exact.get(key)
+            if hit is None:
+                return None
+            expires_at, answer = hit
+            if expires_at < now:
+                del self._exact[key]
+                return None
+            self._exact.move_to_end(key)
+            return answer
+
+    def _prune_expired(self, now: float) -> None:
+        """Drop expired semantic rows so they can't shadow live ones."""
+        if not self._entries:
+            return
+        keep = [
+            i
+            for i, (expires_at, _mode, _answer) in enumerate(self._entries)
+            if expires_at >= now
+        ]
+        if len(keep) == len(self._entries):
+            return
+        if not keep:
+            self._embeddings = None
+            self._entries = []
+            return
+        self._embeddings = self._embeddings[keep]
+        self._entries = [self._entries[i] for i in keep]
+
+    def get_semantic(self, mode: str, embedding: Optional[np.ndarray]) -> Optional[Any]:
+        if embedding is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._prune_expired(now)
+            if self._embeddings is None or not self._entries:
+                return None
+            sims = cosine_scores(self._embeddings, embedding)
+            if sims is None:
+                return None
+            # Restrict the argmax to rows of the requested mode — an "All" run
+            # stores one row per mode under the same embedding, and a global
+            # argmax would always land on whichever mode was stored first.
+            best_idx = None
+            best_sim = float(self.semantic_threshold)
+            for idx, (_expires_at, entry_mode, _answer) in enumerate(self._entries):
+                if entry_mode != mode:
+                    continue
+                sim = float(sims[idx])
+                if sim >= best_sim:
+                    best_sim = sim
+                    best_idx = idx
+            if best_idx is None:
+                return None
+            return self._entries[best_idx][2]
+
+    def put(
+        self, mode: str, query: str, embedding: Optional[np.ndarray], answer: Any
+    ) -> None:
+        expires_at = time.monotonic() + self.ttl
+        key = (mode, _normalize_query(query))
+        with self._lock:
+            self._exact[key] = (expires_at, answer)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.maxsize:
+                self._exact.popitem(last=False)
+
+            if embedding is not None:
+                vec = np.asarray(embedding, dtype=np.float32).ravel()
+                norm = np.linalg.norm(vec)
+                if norm > 0.0:
+                    vec = (vec / norm)[None, :]
+                    if self._embeddings is None:
+                        self._embeddings = vec
+                    else:
+                        self._embeddings = np.vstack([self._embeddings, vec])
+                    self._entries.append((expires_at, mode, answer))
+                    if len(self._entries) > self.maxsize:
+                        self._embeddings = self._embeddings[1:]
+                        self._entries.pop(0)
+
+    def clear(self) -> None:
+        """Drop both tiers — call after the knowledge base changes."""
+        with self._lock:
+            self._exact.clear()
+            self._embeddings = None
+            self._entries = []
@@ -24,6 +24,7 @@ STORAGE_IMPLEMENTATIONS = {
             "MilvusVectorDBStorage",
             "PGVectorStorage",
             "FaissVectorDBStorage",
+            "HNSWVectorStorage",
             "QdrantVectorDBStorage",
             "MongoVectorDBStorage",
             # "ChromaVectorDBStorage",
@@ -69,6 +70,7 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     "ChromaVectorDBStorage": [],
     "PGVectorStorage": ["POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DATABASE"],
     "FaissVectorDBStorage": [],
+    "HNSWVectorStorage": [],
     "QdrantVectorDBStorage": ["QDRANT_URL"],  # QDRANT_API_KEY has default value None
     "MongoVectorDBStorage": [],
     # Document Status Storage Implementations
@@ -99,6 +101,7 @@ STORAGES = {
     "PGGraphStorage": ".kg.postgres_impl",
     "PGDocStatusStorage": ".kg.postgres_impl",
     "FaissVectorDBStorage": ".kg.faiss_impl",
+    "HNSWVectorStorage": ".kg.hnsw_impl",
     "QdrantVectorDBStorage": ".kg.qdrant_impl",
     "MemgraphStorage": ".kg.memgraph_impl",
 }
@@ -0,0 +1,428 @@
+import os
+import time
+import asyncio
+from typing import Any, final
+import json
+import numpy as np
+from dataclasses import dataclass
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+import pipmaster as pm
+
+if not pm.is_installed("hnswlib"):
+    pm.install("hnswlib")
+
+import hnswlib  # type: ignore
+
+
+@final
+@dataclass
+class HNSWVectorStorage(BaseVectorStorage):
+    """
+    An hnswlib-based Vector DB Storage for LightRAG.
+
+    Replaces the default linear O(N·d) scan with an HNSW graph: queries run in
+    roughly O(log N), which matters as the chunk/entity tables grow. The index
+    uses cosine space, so stored vectors need no explicit normalization.
+
+    Tunables (environment variables):
+        HNSW_M                - graph connectivity (default 16)
+        HNSW_EF_CONSTRUCTION  - build-time beam width (default 200)
+        HNSW_EF_SEARCH        - query-time beam width (default 64)
+    """
+
+    def __post_init__(self):
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            os.makedirs(workspace_dir, exist_ok=True)
+            self._index_file = os.path.join(
+                workspace_dir, f"hnsw_index_{self.namespace}.bin"
+            )
+        else:
+            # Default behavior when workspace is empty
+            self._index_file = os.path.join(
+                working_dir, f"hnsw_index_{self.namespace}.bin"
+            )
+        self._meta_file = self._index_file + ".meta.json"
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._m = int(os.getenv("HNSW_M", "16"))
+        self._ef_construction = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+        self._ef_search = int(os.getenv("HNSW_EF_SEARCH", "64"))
+
+        # label (int) -> metadata (including the original ID); labels are
+        # assigned monotonically and never reused, updates mark the old label
+        # deleted inside the graph.
+        self._id_to_meta: dict[int, dict] = {}
+        self._custom_to_label: dict[str, int] = {}
+        self._next_label = 0
+        self._capacity = 1024
+
+        self._index = self._new_index(self._capacity)
+        self._load_index()
+
+    def _new_index(self, capacity: int) -> "hnswlib.Index":
+        index = hnswlib.Index(space="cosine", dim=self._dim)
+        index.init_index(
+            max_elements=capacity,
+            ef_construction=self._ef_construction,
+            M=self._m,
+        )
+        index.set_ef(self._ef_search)
+        return index
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock()
+
+    async def _get_index(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                logger.info(
+                    f"Process {os.getpid()} reloading HNSW {self.namespace} due to update by another process"
+                )
+                self._id_to_meta = {}
+                self._custom_to_label = {}
+                self._next_label = 0
+                self._index = self._new_index(self._capacity)
+                self._load_index()
+                self.storage_updated.value = False
+            return self._index
+
+    def _ensure_capacity(self, additional: int) -> None:
+        needed = self._next_label + additional
+        if needed > self._capacity:
+            while self._capacity < needed:
+                self._capacity *= 2
+            self._index.resize_index(self._capacity)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Insert or update vectors in the HNSW index.
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"HNSW: Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+
+        list_data = []
+        contents = []
+        for k, v in data.items():
+            meta = {mf: v[mf] for mf in self.meta_fields if mf in v}
+            meta["__id__"] = k
+            meta["__created_at__"] = current_time
+            list_data.append(meta)
+            contents.append(v["content"])
+
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list, axis=0).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            logger.error(
+                f"Embedding size mismatch. Embeddings: {len(embeddings)}, Data: {len(list_data)}"
+            )
+            return []
+
+        index = await self._get_index()
+        async with self._storage_lock:
+            # Updates: retire the old point in the graph, insert under a fresh label
+            for meta in list_data:
+                old_label = self._custom_to_label.pop(meta["__id__"], None)
+                if old_label is not None:
+                    try:
+                        index.mark_deleted(old_label)
+                    except RuntimeError:
+                        pass  # already deleted
+                    self._id_to_meta.pop(old_label, None)
+
+            self._ensure_capacity(len(list_data))
+            labels = np.arange(
+                self._next_label, self._next_label + len(list_data), dtype=np.int64
+            )
+            index.add_items(embeddings, labels)
+            self._next_label += len(list_data)
+
+            for label, meta in zip(labels, list_data):
+                self._id_to_meta[int(label)] = meta
+                self._custom_to_label[meta["__id__"]] = int(label)
+
+        logger.debug(f"Upserted {len(list_data)} vectors into HNSW index.")
+        return [m["__id__"] for m in list_data]
+
+    async def query(
+        self, query: str, top_k: int, ids: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Search by a textual query; returns top_k results with their metadata + similarity distance.
+        """
+        embedding = await self.embedding_func(
+            [query], _priority=5
+        )  # higher priority for query
+        embedding = np.array(embedding, dtype=np.float32)
+
+        index = await self._get_index()
+        async with self._storage_lock:
+            count = max(0, len(self._custom_to_label))
+            if count == 0:
+                return []
+            labels, distances = index.knn_query(embedding, k=min(top_k, count))
+
+        results = []
+        for label, dist in zip(labels[0], distances[0]):
+            # hnswlib cosine distance is 1 - cosine similarity
+            similarity = 1.0 - float(dist)
+            if similarity < self.cosine_better_than_threshold:
+                continue
+
+            meta = self._id_to_meta.get(int(label), {})
+            results.append(
+                {
+                    **meta,
+                    "id": meta.get("__id__"),
+                    "distance": similarity,
+                    "created_at": meta.get("__created_at__"),
+                }
+            )
+
+        return results
+
+    @property
+    def client_storage(self):
+        # Return whatever structure LightRAG might need for debugging
+        return {"data": list(self._id_to_meta.values())}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"Deleting {len(ids)} vectors from {self.namespace}")
+        index = await self._get_index()
+        removed = 0
+        async with self._storage_lock:
+            for cid in ids:
+                label = self._custom_to_label.pop(cid, None)
+                if label is None:
+                    continue
+                try:
+                    index.mark_deleted(label)
+                except RuntimeError:
+                    pass  # already deleted
+                self._id_to_meta.pop(label, None)
+                removed += 1
+        logger.debug(f"Successfully deleted {removed} vectors from {self.namespace}")
+
+    async def delete_entity(self, entity_name: str) -> None:
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(f"Attempting to delete entity {entity_name} with ID {entity_id}")
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        logger.debug(f"Searching relations for entity {entity_name}")
+        relation_ids = [
+            meta["__id__"]
+            for meta in self._id_to_meta.values()
+            if meta.get("src_id") == entity_name or meta.get("tgt_id") == entity_name
+        ]
+        logger.debug(f"Found {len(relation_ids)} relations for {entity_name}")
+        if relation_ids:
+            await self.delete(relation_ids)
+            logger.debug(f"Deleted {len(relation_ids)} relations for {entity_name}")
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        label = self._custom_to_label.get(id)
+        if label is None:
+            return None
+        meta = self._id_to_meta.get(label)
+        if meta is None:
+            return None
+        return {
+            **meta,
+            "id": meta.get("__id__"),
+            "created_at": meta.get("__created_at__"),
+        }
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        results = []
+        for id in ids:
+            dp = await self.get_by_id(id)
+            if dp is not None:
+                results.append(dp)
+        return results
+
+    def _save_index(self):
+        """
+        Save the current HNSW index + metadata to disk so it can persist across runs.
+        """
+        self._index.save_index(self._index_file)
+
+        # JSON requires string keys; labels go back to int on load.
+        serializable_meta = {
+            str(label): meta for label, meta in self._id_to_meta.items()
+        }
+        with open(self._meta_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "next_label": self._next_label,
+                    "capacity": self._capacity,
+                    "meta": serializable_meta,
+                },
+                f,
+            )
+
+    def _load_index(self):
+        """
+        Load the HNSW index + metadata from disk if it exists,
+        and rebuild in-memory structures so we can query.
+        """
+        if not os.path.exists(self._index_file):
+            logger.warning(f"No existing HNSW index file found for {self.namespace}")
+            return
+
+        try:
+            with open(self._meta_file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+
+            self._next_label = int(stored["next_label"])
+            self._capacity = int(stored["capacity"])
+            self._id_to_meta = {
+                int(label): meta for label, meta in stored["meta"].items()
+            }
+            self._custom_to_label = {
+                meta["__id__"]: label for label, meta in self._id_to_meta.items()
+            }
+
+            self._index = hnswlib.Index(space="cosine", dim=self._dim)
+            self._index.load_index(self._index_file, max_elements=self._capacity)
+            self._index.set_ef(self._ef_search)
+
+            logger.info(
+                f"HNSW index loaded with {len(self._custom_to_label)} vectors from {self._index_file}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load HNSW index or metadata: {e}")
+            logger.warning("Starting with an empty HNSW index.")
+            self._id_to_meta = {}
+            self._custom_to_label = {}
+            self._next_label = 0
+            self._capacity = 1024
+            self._index = self._new_index(self._capacity)
+
+    async def index_done_callback(self) -> None:
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"Storage for HNSW {self.namespace} was updated by another process, reloading..."
+                )
+                self._id_to_meta = {}
+                self._custom_to_label = {}
+                self._next_label = 0
+                self._index = self._new_index(self._capacity)
+                self._load_index()
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                # Save data to disk
+                self._save_index()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+            except Exception as e:
+                logger.error(f"Error saving HNSW index for {self.namespace}: {e}")
+                return False  # Return error
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                for path in (self._index_file, self._meta_file):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+                self._id_to_meta = {}
+                self._custom_to_label = {}
+                self._next_label = 0
+                self._capacity = 1024
+                self._index = self._new_index(self._capacity)
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"Process {os.getpid()} drop HNSW {self.namespace}(file:{self._index_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"Error dropping HNSW {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
@@ -1,7 +1,9 @@
 from ..utils import verbose_debug, VERBOSE_DEBUG
 import sys
 import os
+import asyncio
 import logging
+import weakref
 
 if sys.version_info < (3, 9):
     from typing import AsyncIterator
@@ -13,6 +15,7 @@ import pipmaster as pm  # Pipmaster for dynamic library install
 if not pm.is_installed("openai"):
     pm.install("openai")
 
+import httpx
 from openai import (
     AsyncOpenAI,
     APIConnectionError,
@@ -51,6 +54,46 @@ class InvalidResponseError(Exception):
     pass
 
 
+class _SharedAsyncHttpClient(httpx.AsyncClient):
+    """httpx client shared by every per-call AsyncOpenAI wrapper.
+
+    aclose() is a no-op: the wrappers in this module defensively close their
+    client after each call, which must not tear down the shared connection
+    pool. Connections are reclaimed by keepalive expiry / interpreter exit.
+    """
+
+    async def aclose(self) -> None:
+        return None
+
+
+# One pool per event loop: keepalive connections are bound to the loop that
+# opened them, so sharing a single pool across loops (e.g. several
+# asyncio.run() invocations in one process) would resurrect sockets owned by a
+# dead loop. Weak keys let a pool be collected with its loop.
+_shared_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_shared_http_client() -> httpx.AsyncClient | None:
+    """Lazily create the per-loop HTTP connection pool for OpenAI calls.
+
+    Reusing one pool keeps TCP+TLS session setup (50-200ms per call) off every
+    embedding/LLM request instead of paying it per AsyncOpenAI instance.
+    Returns None when called without a running loop — the caller then lets
+    AsyncOpenAI manage its own transport.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    client = _shared_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _SharedAsyncHttpClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        _shared_http_clients[loop] = client
+    return client
+
+
 def create_openai_async_client(
     api_key: str | None = None,
     base_url: str | None = None,
@@ -86,6 +129,13 @@ def create_openai_async_client(
         "api_key": api_key,
     }
 
+    # Route every client through the loop's shared connection pool unless the
+    # caller brought their own transport.
+    if "http_client" not in merged_configs:
+        shared_client = _get_shared_http_client()
+        if shared_client is not None:
+            merged_configs["http_client"] = shared_client
+
     if base_url is not None:
         merged_configs["base_url"] = base_url
     else: